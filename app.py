@@ -1,5 +1,6 @@
 import io
 import zipfile
+from typing import Tuple
 
 import pandas as pd
 import streamlit as st
@@ -7,12 +8,18 @@ import streamlit as st
 from parsers.order_parser import parse_order_details_pdfs
 from parsers.shipping_parser import parse_shipping_label_pdfs
 from parsers.label_matcher import match_orders_to_labels
-from generators.csv_generator import expand_by_quantity, generate_design_csvs
+from generators.csv_generator import (
+    expand_by_quantity,
+    generate_design_csvs,
+    prepare_records,
+)
 from generators.gift_exporter import generate_gift_messages_csv
 from generators.label_generator import (
     generate_manufacturing_labels_pdf,
     generate_gift_message_labels_pdf,  # NEW
 )
+from utils.frame_cache import cache_key, load_cached_frame, store_cached_frame
+from utils.helpers import read_once
 
 # ---------------------------------------------------------
 # Streamlit app config
@@ -35,6 +42,72 @@ instead of page order.
 """
 )
 
+# ---------------------------------------------------------
+# Cached parsing (keyed on uploaded file bytes)
+# ---------------------------------------------------------
+def _rehydrate_uploads(file_bytes: Tuple[bytes, ...],
+                       file_names: Tuple[str, ...]):
+    """
+    Rebuild file-like objects (with a .name) from raw upload bytes
+    so the parsers can consume them like Streamlit UploadedFiles.
+    """
+    files = []
+    for data, name in zip(file_bytes, file_names):
+        f = io.BytesIO(data)
+        f.name = name
+        files.append(f)
+    return files
+
+
+@st.cache_data(show_spinner=False)
+def _parse_orders_cached(file_bytes: Tuple[bytes, ...],
+                         file_names: Tuple[str, ...]) -> pd.DataFrame:
+    key = cache_key(file_bytes, file_names)
+    df = load_cached_frame("orders", key)
+    if df is None:
+        df = parse_order_details_pdfs(_rehydrate_uploads(file_bytes, file_names))
+        store_cached_frame("orders", key, df)
+    return df
+
+
+@st.cache_data(show_spinner=False)
+def _parse_shipping_cached(file_bytes: Tuple[bytes, ...],
+                           file_names: Tuple[str, ...]) -> pd.DataFrame:
+    key = cache_key(file_bytes, file_names)
+    df = load_cached_frame("labels", key)
+    if df is None:
+        df = parse_shipping_label_pdfs(_rehydrate_uploads(file_bytes, file_names))
+        store_cached_frame("labels", key, df)
+    return df
+
+
+# Design CSV bundles smaller than this are zipped without compression
+ZIP_DEFLATE_MIN_BYTES = 256 * 1024
+
+# Low-cardinality text columns stored as pandas categoricals
+CATEGORICAL_COLS = (
+    "sku",
+    "design_number",
+    "order_option",
+    "gift_option",
+    "shipping_label_status",
+    "matched_label_id",
+)
+
+
+def _optimize_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Shrink the parsed orders frame: categoricals for repeated strings,
+    smallest unsigned int for quantity. order_date stays as parsed text
+    so dates parse_order_dates couldn't normalize still display as-is.
+    """
+    for col in CATEGORICAL_COLS:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+    df["quantity"] = pd.to_numeric(df["quantity"], downcast="unsigned")
+    return df
+
+
 # ---------------------------------------------------------
 # Sidebar: file uploads
 # ---------------------------------------------------------
@@ -63,6 +136,14 @@ if "orders_df" not in st.session_state:
 if "labels_df" not in st.session_state:
     st.session_state["labels_df"] = pd.DataFrame()
 
+# Filter option tuples, recomputed only when a new parse runs.
+# The same tuple object is reused on every rerun for the multiselects.
+if "design_options" not in st.session_state:
+    st.session_state["design_options"] = ()
+
+if "sku_options" not in st.session_state:
+    st.session_state["sku_options"] = ()
+
 # ---------------------------------------------------------
 # Run parsing when button is clicked
 # ---------------------------------------------------------
@@ -73,7 +154,10 @@ if run_btn:
 
     # Parse orders
     with st.spinner("Parsing order details..."):
-        orders_df = parse_order_details_pdfs(order_files)
+        orders_df = _parse_orders_cached(
+            tuple(read_once(f) for f in order_files),
+            tuple(f.name for f in order_files),
+        )
 
     if orders_df.empty:
         st.error("No orders were parsed. Please check your PDFs.")
@@ -85,16 +169,35 @@ if run_btn:
     # Parse shipping labels (optional)
     if shipping_files:
         with st.spinner("Parsing shipping labels..."):
-            labels_df = parse_shipping_label_pdfs(shipping_files)
+            labels_df = _parse_shipping_cached(
+                tuple(read_once(f) for f in shipping_files),
+                tuple(f.name for f in shipping_files),
+            )
         with st.spinner("Matching shipping labels to orders..."):
             orders_df = match_orders_to_labels(orders_df, labels_df)
     else:
         orders_df["shipping_label_status"] = "⚠️ Missing"
         orders_df["matched_label_id"] = ""
 
+    orders_df = _optimize_dtypes(orders_df)
+
+    # Lowercased copies for the buyer search (hidden from display_cols)
+    orders_df["_buyer_lower"] = orders_df["buyer_name"].fillna("").str.lower()
+    orders_df["_ship_lower"] = orders_df["ship_to_name"].fillna("").str.lower()
+    # datetime64 copy of order_date for the date filter (NaT if unparsed)
+    orders_df["_order_ts"] = pd.to_datetime(
+        orders_df["order_date"], format="%Y-%m-%d", errors="coerce"
+    )
+
     # Save results to session state so they persist across reruns/tab switches
     st.session_state["orders_df"] = orders_df
     st.session_state["labels_df"] = labels_df
+    st.session_state["design_options"] = tuple(sorted(
+        orders_df["design_number"].dropna().unique().tolist()
+    ))
+    st.session_state["sku_options"] = tuple(sorted(
+        orders_df["sku"].dropna().unique().tolist()
+    ))
 
 # ---------------------------------------------------------
 # If we don't have parsed data yet, show instructions
@@ -115,8 +218,8 @@ st.subheader("Parsed Orders (Before Quantity Expansion)")
 # ---- Filters ----
 col1, col2, col3, col4 = st.columns(4)
 
-# Prepare date series safely
-date_series = pd.to_datetime(orders_df["order_date"], errors="coerce")
+# _order_ts is order_date as datetime64 (converted once at parse time)
+date_series = orders_df["_order_ts"]
 
 with col1:
     if date_series.notna().any():
@@ -131,18 +234,18 @@ with col1:
         date_filter = None
 
 with col2:
-    design_options = sorted(orders_df["design_number"].dropna().unique().tolist())
+    design_options = st.session_state["design_options"]
     design_filter = st.multiselect(
         "Design #",
-        design_options,
+        options=design_options,
         default=design_options,
     )
 
 with col3:
-    sku_options = sorted(orders_df["sku"].dropna().unique().tolist())
+    sku_options = st.session_state["sku_options"]
     sku_filter = st.multiselect(
         "SKU",
-        sku_options,
+        options=sku_options,
         default=sku_options,
     )
 
@@ -150,29 +253,34 @@ with col4:
     buyer_search = st.text_input("Search Buyer Name", "")
 
 # ---- Apply filters ----
-filtered = orders_df.copy()
+# Accumulate one boolean mask and index the frame once
+mask = pd.Series(True, index=orders_df.index)
 
 # Date range filter (if we have a valid range)
 if isinstance(date_filter, tuple) and len(date_filter) == 2:
     start_date, end_date = date_filter
     if start_date and end_date:
-        mask = date_series.dt.date.between(start_date, end_date)
-        filtered = filtered[mask]
+        start_ts = pd.Timestamp(start_date)
+        end_ts = pd.Timestamp(end_date) + pd.Timedelta(days=1)
+        mask &= (date_series >= start_ts) & (date_series < end_ts)
 
-# Design filter
-if design_filter:
-    filtered = filtered[filtered["design_number"].isin(design_filter)]
+# Design filter (skipped while every option is still selected)
+if design_filter and len(design_filter) < len(design_options):
+    mask &= orders_df["design_number"].isin(design_filter)
 
-# SKU filter
-if sku_filter:
-    filtered = filtered[filtered["sku"].isin(sku_filter)]
+# SKU filter (skipped while every option is still selected)
+if sku_filter and len(sku_filter) < len(sku_options):
+    mask &= orders_df["sku"].isin(sku_filter)
 
 # Buyer name search (short name or full ship_to_name)
 if buyer_search:
-    filtered = filtered[
-        filtered["buyer_name"].str.contains(buyer_search, case=False, na=False)
-        | filtered["ship_to_name"].str.contains(buyer_search, case=False, na=False)
-    ]
+    needle = buyer_search.lower()
+    mask &= (
+        orders_df["_buyer_lower"].str.contains(needle, regex=False)
+        | orders_df["_ship_lower"].str.contains(needle, regex=False)
+    )
+
+filtered = orders_df if mask.all() else orders_df.loc[mask]
 
 display_cols = [
     "buyer_name",
@@ -196,30 +304,39 @@ st.dataframe(filtered[display_cols], use_container_width=True)
 # -----------------------------------------------------
 expanded_df = expand_by_quantity(filtered)
 
+# Stripped/formatted column arrays shared by the CSV and label generators
+records = prepare_records(expanded_df)
+
 st.markdown("---")
 st.subheader("Downloads")
 
 # -----------------------------------------------------
 # 1) Design-specific LightBurn CSVs
 # -----------------------------------------------------
-design_csvs = generate_design_csvs(expanded_df)
+design_csvs = generate_design_csvs(expanded_df, records)
 
 if design_csvs:
     st.markdown("### LightBurn CSVs (per design)")
 
-    # Individual design CSV buttons
-    for design in sorted(design_csvs.keys()):
+    # Individual design CSV buttons (dict is already in design order)
+    for design, csv_bytes in design_csvs.items():
         st.download_button(
             label=f"Download design_{design}.csv",
             file_name=f"design_{design}.csv",
             mime="text/csv",
-            data=design_csvs[design],
+            data=csv_bytes,
             key=f"dl_design_{design}",
         )
 
-    # All design CSVs in one ZIP
+    # All design CSVs in one ZIP (only compress bundles big enough to matter)
+    total_csv_bytes = sum(len(b) for b in design_csvs.values())
+    zip_mode = (
+        zipfile.ZIP_DEFLATED
+        if total_csv_bytes > ZIP_DEFLATE_MIN_BYTES
+        else zipfile.ZIP_STORED
+    )
     zip_buf = io.BytesIO()
-    with zipfile.ZipFile(zip_buf, "w", zipfile.ZIP_DEFLATED) as zf:
+    with zipfile.ZipFile(zip_buf, "w", zip_mode) as zf:
         for design, csv_bytes in design_csvs.items():
             zf.writestr(f"design_{design}.csv", csv_bytes)
     zip_buf.seek(0)
@@ -272,7 +389,7 @@ else:
 # -----------------------------------------------------
 st.markdown("### Manufacturing Labels (4×6 PDF)")
 
-labels_pdf = generate_manufacturing_labels_pdf(expanded_df)
+labels_pdf = generate_manufacturing_labels_pdf(expanded_df, records)
 if labels_pdf:
     st.download_button(
         label="Download Manufacturing Labels PDF",
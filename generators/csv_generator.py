@@ -1,9 +1,23 @@
-import io
-from typing import Dict
+from typing import Dict, Optional
 
+import numpy as np
 import pandas as pd
 
-from utils.helpers import file_friendly_name, safe_strip
+from utils.helpers import file_friendly_name
+
+# Free-text columns copied into the LightBurn CSVs
+TEXT_COLS = [
+    "board_customization_note",
+    "engraving_letter",
+    "order_id",
+    "order_item_id",
+    "order_option",
+    "gift_option",
+    "gift_message",
+]
+
+# Text columns prepared once for both the CSVs and the manufacturing labels
+RECORD_TEXT_COLS = TEXT_COLS + ["buyer_name", "ship_to_name", "order_date"]
 
 
 def expand_by_quantity(df: pd.DataFrame) -> pd.DataFrame:
@@ -13,66 +27,82 @@ def expand_by_quantity(df: pd.DataFrame) -> pd.DataFrame:
     if df.empty:
         return df
 
-    df = df.copy()
-    df["quantity"] = df["quantity"].fillna(1).astype(int)
-    expanded = df.loc[df.index.repeat(df["quantity"])].copy()
-    expanded.reset_index(drop=True, inplace=True)
-    return expanded
+    qty = df["quantity"].fillna(1).to_numpy(dtype=np.int64)
+    idx = np.repeat(np.arange(len(df), dtype=np.int64), qty)
+    return df.iloc[idx].reset_index(drop=True)
+
+
+def _strip_column(s: pd.Series) -> np.ndarray:
+    """
+    Column-wise safe_strip: missing -> "", everything else str().strip().
+    Categoricals go through object so "" need not be a category.
+    """
+    return s.astype(object).fillna("").astype(str).str.strip().to_numpy()
+
+
+def prepare_records(expanded_df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """
+    Build the column arrays shared by the design CSVs and the
+    manufacturing labels, so both generators read the same prepared data:
+      - every text field, stripped (missing -> "")
+      - design_number as display text and "design" as float (NaN if missing)
+      - quantity as display text
+    """
+    records = {col: _strip_column(expanded_df[col]) for col in RECORD_TEXT_COLS}
+
+    design = pd.to_numeric(
+        expanded_df["design_number"].astype(object), errors="coerce"
+    ).to_numpy(dtype=float)
+    records["design"] = design
+    records["design_number"] = np.array(
+        ["" if np.isnan(d) else str(int(d)) for d in design], dtype=object
+    )
+
+    records["quantity"] = _strip_column(expanded_df["quantity"])
 
+    return records
 
-def generate_design_csvs(expanded_df: pd.DataFrame) -> Dict[int, bytes]:
+
+def generate_design_csvs(expanded_df: pd.DataFrame,
+                         records: Optional[Dict[str, np.ndarray]] = None
+                         ) -> Dict[int, bytes]:
     """
     For each design number 1-9, create a CSV in the LightBurn format:
     csvbuyer_name,design,line1,line2,line3,initial,order_id,order_item_id,
     board_type,gift_note,gift_message
-    Returns a dict: {design_number: csv_bytes}
+    Pass `records` from prepare_records() to reuse already prepared columns.
+    Returns a dict: {design_number: csv_bytes}, ordered by design number.
     """
     design_csvs = {}
 
     if expanded_df.empty:
         return design_csvs
 
-    df = expanded_df.copy()
-    df = df[df["design_number"].notna()]
-
-    for design in sorted(df["design_number"].dropna().unique()):
-        d = df[df["design_number"] == design].copy()
-
-        rows = []
-        for _, row in d.iterrows():
-            buyer_file_name = file_friendly_name(
-                f"{row.get('buyer_name', '')} {row.get('ship_to_name', '')}"
-            )
-            rows.append({
-                "csvbuyer_name": buyer_file_name,
-                "design": int(design),
-                "line1": safe_strip(row.get("board_customization_note", "")),
-                "line2": "",
-                "line3": "",
-                "initial": safe_strip(row.get("engraving_letter", "")),
-                "order_id": safe_strip(row.get("order_id", "")),
-                "order_item_id": safe_strip(row.get("order_item_id", "")),
-                "board_type": safe_strip(row.get("order_option", "")),
-                "gift_note": safe_strip(row.get("gift_option", "")),
-                "gift_message": safe_strip(row.get("gift_message", "")),
-            })
-
-        design_df = pd.DataFrame(rows, columns=[
-            "csvbuyer_name",
-            "design",
-            "line1",
-            "line2",
-            "line3",
-            "initial",
-            "order_id",
-            "order_item_id",
-            "board_type",
-            "gift_note",
-            "gift_message",
-        ])
-
-        buffer = io.StringIO()
-        design_df.to_csv(buffer, index=False)
-        design_csvs[int(design)] = buffer.getvalue().encode("utf-8")
+    if records is None:
+        records = prepare_records(expanded_df)
+
+    keep = ~np.isnan(records["design"])
+    if not keep.any():
+        return design_csvs
+
+    rec = {name: arr[keep] for name, arr in records.items()}
+    buyer_full = pd.Series(rec["buyer_name"]) + " " + pd.Series(rec["ship_to_name"])
+
+    out = pd.DataFrame({
+        "csvbuyer_name": buyer_full.map(file_friendly_name),
+        "design": rec["design"].astype(int),
+        "line1": rec["board_customization_note"],
+        "line2": "",
+        "line3": "",
+        "initial": rec["engraving_letter"],
+        "order_id": rec["order_id"],
+        "order_item_id": rec["order_item_id"],
+        "board_type": rec["order_option"],
+        "gift_note": rec["gift_option"],
+        "gift_message": rec["gift_message"],
+    })
+
+    for design, design_df in out.groupby("design", sort=True):
+        design_csvs[int(design)] = design_df.to_csv(index=False).encode("utf-8")
 
     return design_csvs
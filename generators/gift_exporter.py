@@ -1,4 +1,4 @@
-import io
+import numpy as np
 import pandas as pd
 
 
@@ -13,13 +13,20 @@ def generate_gift_messages_csv(expanded_df: pd.DataFrame) -> bytes:
     if expanded_df.empty:
         return b""
 
-    df = expanded_df.copy()
-    df = df[df["gift_option"].str.upper() == "YES"]
+    gift_option = expanded_df["gift_option"]
+    if isinstance(gift_option.dtype, pd.CategoricalDtype):
+        # Compare integer codes against the code(s) whose category is YES
+        yes_codes = np.flatnonzero(
+            gift_option.cat.categories.astype(str).str.upper() == "YES"
+        )
+        mask = np.isin(gift_option.cat.codes.to_numpy(), yes_codes)
+    else:
+        mask = gift_option.astype("string").str.upper().eq("YES").fillna(False)
 
-    if df.empty:
+    if not mask.any():
         return b""
 
-    out = df[[
+    out = expanded_df.loc[mask, [
         "ship_to_name",
         "order_id",
         "gift_message"
@@ -29,6 +36,4 @@ def generate_gift_messages_csv(expanded_df: pd.DataFrame) -> bytes:
         "gift_message": "Gift Message",
     })
 
-    buf = io.StringIO()
-    out.to_csv(buf, index=False)
-    return buf.getvalue().encode("utf-8")
+    return out.to_csv(index=False).encode("utf-8")
@@ -1,21 +1,90 @@
+import string
+from functools import lru_cache
 from io import BytesIO
+from typing import Dict, List
+
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import inch, landscape
 from reportlab.lib import colors
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+from generators.csv_generator import prepare_records
+
+# Prepared record columns read by each manufacturing label (in loop order)
+MFG_LABEL_FIELDS = (
+    "order_id",
+    "quantity",
+    "buyer_name",
+    "order_date",
+    "design_number",
+    "board_customization_note",
+    "engraving_letter",
+)
+
+
+@lru_cache(maxsize=None)
+def _char_widths(font: str, size: float) -> Dict[str, float]:
+    """
+    Per-character width table for one font/size, for printable ASCII.
+    Read-only: callers measure other characters with stringWidth.
+    """
+    return {ch: stringWidth(ch, font, size) for ch in string.printable}
+
+
+@lru_cache(maxsize=4096)
+def _word_width(word: str, font: str, size: float) -> float:
+    widths = _char_widths(font, size)
+    total = 0.0
+    for ch in word:
+        w = widths.get(ch)
+        total += w if w is not None else stringWidth(ch, font, size)
+    return total
+
+
+def wrap_text(text: str, font: str, size: float, max_width: float) -> List[str]:
+    """
+    Greedy word wrap: pack words into lines narrower than max_width.
+    Line widths are summed from cached per-word widths.
+    """
+    space_w = _word_width(" ", font, size)
+    lines = []
+    current_line = []
+    current_w = 0.0
+
+    for word in text.split():
+        word_w = _word_width(word, font, size)
+        test_w = current_w + space_w + word_w if current_line else word_w
+        if test_w < max_width:
+            current_line.append(word)
+            current_w = test_w
+        else:
+            if current_line:
+                lines.append(" ".join(current_line))
+            current_line = [word]
+            current_w = word_w
+
+    if current_line:
+        lines.append(" ".join(current_line))
+
+    return lines
 
 
 # ============================================================
 #   MANUFACTURING LABELS (4×6) — Charcuterie Boards
 # ============================================================
-def generate_manufacturing_labels_pdf(df):
+def generate_manufacturing_labels_pdf(df, records=None):
     """
     Generate a 4×6 manufacturing labels PDF for charcuterie boards.
     One label per physical board (after quantity expansion).
+    Pass `records` from prepare_records() to reuse already prepared columns.
     """
 
     if df.empty:
         return None
 
+    if records is None:
+        records = prepare_records(df)
+
     buf = BytesIO()
     page_size = landscape((4 * inch, 6 * inch))
     c = canvas.Canvas(buf, pagesize=page_size)
@@ -25,45 +94,41 @@ def generate_manufacturing_labels_pdf(df):
     right = W - 0.3 * inch
     top = H - 0.3 * inch
 
-    for _, row in df.iterrows():
-        y = top
-
-        # Order ID + Quantity
+    # Fixed layout positions (same on every label)
+    order_y = top
+    buyer_y = order_y - 0.28 * inch
+    box_h = 0.9 * inch
+    box_y = buyer_y - 0.32 * inch - box_h
+    box_x = left + 0.15 * inch
+    design_y = box_y + box_h - 0.30 * inch
+    note_y = box_y + box_h - 0.65 * inch
+    letter_y = box_y - 0.4 * inch
+
+    rows = zip(*(records[col] for col in MFG_LABEL_FIELDS))
+    for (order_id, quantity, buyer_name, order_date,
+         design_number, note, engraving_letter) in rows:
+        # Grouped by font so each font is set once per page
+        # Order ID + Quantity, Note
         c.setFont("Helvetica-Bold", 14)
-        c.drawString(left, y, f"Order ID: {row.get('order_id', '')}")
-        c.drawRightString(right, y, f"Qty: {row.get('quantity', 1)}")
-        y -= 0.28 * inch
+        c.drawString(left, order_y, f"Order ID: {order_id}")
+        c.drawRightString(right, order_y, f"Qty: {quantity}")
+        c.drawString(box_x, note_y, f"Note: {note}")
 
         # Buyer + Date
         c.setFont("Helvetica", 13)
-        c.drawString(left, y, f"Buyer: {row.get('buyer_name', '')}")
-        c.drawRightString(right, y, f"Date: {row.get('order_date', '')}")
-        y -= 0.32 * inch
+        c.drawString(left, buyer_y, f"Buyer: {buyer_name}")
+        c.drawRightString(right, buyer_y, f"Date: {order_date}")
 
-        # Engraving box
-        box_h = 0.9 * inch
-        box_y = y - box_h
+        # Engraving box + Design
         c.setLineWidth(2)
         c.rect(left, box_y, right - left, box_h, stroke=1, fill=0)
-
         c.setFont("Helvetica-Bold", 16)
-        c.drawString(left + 0.15 * inch, box_y + box_h - 0.30 * inch,
-                     f"Design: {row.get('design_number', '')}")
-
-        note = row.get("board_customization_note", "")
-        c.setFont("Helvetica-Bold", 14)
-        c.drawString(left + 0.15 * inch,
-                     box_y + box_h - 0.65 * inch,
-                     f"Note: {note}")
-
-        y = box_y - 0.4 * inch
+        c.drawString(box_x, design_y, f"Design: {design_number}")
 
         # Engraving letter (if exists)
-        engraving_letter = str(row.get("engraving_letter", "")).strip()
         if engraving_letter:
             c.setFont("Helvetica-Bold", 28)
-            c.drawString(left, y, f"Letter: {engraving_letter}")
-            y -= 0.35 * inch
+            c.drawString(left, letter_y, f"Letter: {engraving_letter}")
 
         c.showPage()
 
@@ -100,8 +165,8 @@ def generate_gift_message_labels_pdf(df):
     c = canvas.Canvas(buf, pagesize=page_size)
     W, H = page_size
 
-    for _, row in gift_df.iterrows():
-        message = str(row["gift_message"]).strip()
+    for row in gift_df[["gift_message"]].itertuples(index=False, name="Row"):
+        message = str(row.gift_message).strip()
 
         # Outer border (same as blanket)
         c.setStrokeColor(colors.black)
@@ -112,22 +177,7 @@ def generate_gift_message_labels_pdf(df):
         c.setFont("Times-BoldItalic", 18)
 
         # Word wrap manually (same as blanket)
-        words = message.split()
-        lines = []
-        current_line = []
-        max_width = W - 1.2 * inch
-
-        for word in words:
-            test = " ".join(current_line + [word])
-            if c.stringWidth(test, "Times-BoldItalic", 18) < max_width:
-                current_line.append(word)
-            else:
-                if current_line:
-                    lines.append(" ".join(current_line))
-                current_line = [word]
-
-        if current_line:
-            lines.append(" ".join(current_line))
+        lines = wrap_text(message, "Times-BoldItalic", 18, W - 1.2 * inch)
 
         # Vertical centering
         line_h = 0.30 * inch
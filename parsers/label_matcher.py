@@ -1,6 +1,18 @@
+import numpy as np
 import pandas as pd
 
-from utils.helpers import normalize_for_match, fuzzy_equal
+from utils.helpers import fuzzy_equal
+
+
+def _normalize_col(s: pd.Series) -> pd.Series:
+    """
+    Vectorized normalize_for_match: lowercase, keep only [a-z0-9].
+    """
+    return (
+        s.fillna("").astype(str)
+        .str.lower()
+        .str.replace(r"[^a-z0-9]+", "", regex=True)
+    )
 
 
 def match_orders_to_labels(orders_df: pd.DataFrame,
@@ -10,49 +22,54 @@ def match_orders_to_labels(orders_df: pd.DataFrame,
     - ZIP (exact)
     - Address line 1 (normalized)
     - Recipient name (fuzzy)
+    The first matching label (in labels_df order) wins.
     """
     if orders_df.empty or labels_df.empty:
-        orders_df = orders_df.copy()
-        orders_df["shipping_label_status"] = "⚠️ Missing"
-        orders_df["matched_label_id"] = ""
-        return orders_df
-
-    labels_df = labels_df.copy()
-    labels_df["norm_addr1"] = labels_df["address_line1"].fillna("").apply(
-        normalize_for_match
+        return orders_df.assign(
+            shipping_label_status="⚠️ Missing",
+            matched_label_id="",
+        )
+
+    # Match keys as local arrays; neither input frame is modified
+    o_zip = orders_df["zip"].fillna("").astype(str).to_numpy()
+    o_addr = _normalize_col(orders_df["address_line1"]).to_numpy()
+    keyed = (o_zip != "") & (o_addr != "")
+
+    # Candidate pairs: exact ZIP + normalized address (both non-empty)
+    keyed_orders = pd.DataFrame({
+        "order_pos": np.flatnonzero(keyed),
+        "norm_zip": o_zip[keyed],
+        "norm_addr1": o_addr[keyed],
+        "ship_to_name": orders_df["ship_to_name"].to_numpy()[keyed],
+    })
+    label_keys = pd.DataFrame({
+        "label_pos": np.arange(len(labels_df)),
+        "norm_zip": labels_df["zip"].fillna("").astype(str).to_numpy(),
+        "norm_addr1": _normalize_col(labels_df["address_line1"]).to_numpy(),
+        "label_id": labels_df["label_id"].to_numpy(),
+        "recipient_name": labels_df["recipient_name"].to_numpy(),
+    })
+    cand = keyed_orders.merge(
+        label_keys, on=["norm_zip", "norm_addr1"], how="inner"
     )
-    labels_df["norm_zip"] = labels_df["zip"].fillna("").astype(str)
 
-    orders_df = orders_df.copy()
-    orders_df["norm_addr1"] = orders_df["address_line1"].fillna("").apply(
-        normalize_for_match
+    # Names fuzzy match (ship_to_name vs recipient_name), candidates only
+    name_ok = [
+        fuzzy_equal(a, b)
+        for a, b in zip(cand["ship_to_name"], cand["recipient_name"])
+    ]
+    cand = cand[np.array(name_ok, dtype=bool)]
+
+    # First matching label per order
+    first = (
+        cand.sort_values(["order_pos", "label_pos"], kind="stable")
+        .drop_duplicates("order_pos", keep="first")
+    )
+
+    matched = np.full(len(orders_df), "", dtype=object)
+    matched[first["order_pos"].to_numpy()] = first["label_id"].to_numpy()
+
+    return orders_df.assign(
+        matched_label_id=matched,
+        shipping_label_status=np.where(matched != "", "✓ Matched", "⚠️ Missing"),
     )
-    orders_df["norm_zip"] = orders_df["zip"].fillna("").astype(str)
-
-    label_map = []
-
-    for idx, row in orders_df.iterrows():
-        best_label_id = ""
-        status = "⚠️ Missing"
-
-        for _, lab in labels_df.iterrows():
-            if row["norm_zip"] and row["norm_zip"] == lab["norm_zip"]:
-                # Address must match strongly
-                if row["norm_addr1"] and row["norm_addr1"] == lab["norm_addr1"]:
-                    # Names fuzzy match (ship_to_name vs recipient_name)
-                    if fuzzy_equal(
-                        row.get("ship_to_name", ""),
-                        lab.get("recipient_name", "")
-                    ):
-                        best_label_id = lab["label_id"]
-                        status = "✓ Matched"
-                        break
-
-        label_map.append((best_label_id, status))
-
-    orders_df["matched_label_id"] = [m[0] for m in label_map]
-    orders_df["shipping_label_status"] = [m[1] for m in label_map]
-
-    # Clean up helper columns
-    orders_df = orders_df.drop(columns=["norm_addr1", "norm_zip"], errors="ignore")
-    return orders_df
@@ -1,15 +1,51 @@
-import io
 import re
-from typing import List
+from collections import defaultdict
+from typing import List, Optional
 
-import pdfplumber
+import pymupdf
 import pandas as pd
 
 from utils.helpers import (
     safe_strip,
-    normalize_board_type,
-    parse_order_date,
+    normalize_board_types,
+    parse_order_dates,
     extract_city_state_zip,
+    read_once,
+)
+from utils.parallel import PARALLEL_MIN_BYTES, process_map
+
+# Precompiled patterns (hot per-segment paths)
+_SEGMENT_START_RE = re.compile(r"Order ID:\s*\d{3}-\d{7}-\d{7}")
+_ZIP_RE = re.compile(r"\b\d{5}(?:-\d{4})?\b")
+_COUNTRY_RE = re.compile(r"united states|usa|canada|mexico", re.IGNORECASE)
+
+_ORDER_ID_RE = re.compile(r"Order ID:\s*([\d-]+)")
+_ORDER_ITEM_RE = re.compile(r"Order Item ID:\s*([A-Z0-9]+)")
+_ORDER_DATE_RE = re.compile(r"Order Date:\s*(.+)")
+_SKU_RE = re.compile(r"SKU:\s*([A-Z0-9\-]+)")
+_ASIN_RE = re.compile(r"ASIN:\s*([A-Z0-9]+)")
+_QTY_RE = re.compile(r"(Qty|Quantity):\s*(\d+)")
+
+_CUSTOMIZATIONS_RE = re.compile(
+    r"Customizations:(.*?)(?:Surface 2:|$)", re.DOTALL | re.IGNORECASE
+)
+_ORDER_OPTION_RE = re.compile(r"Select Your Order:\s*(.+)", re.IGNORECASE)
+_DESIGN_RE = re.compile(
+    r"Choose Your Design\s*#?:\s*Design\s*(\d+)", re.IGNORECASE
+)
+_DESIGN_FALLBACK_RE = re.compile(r"Design\s*#?\s*[:\-]?\s*(\d+)", re.IGNORECASE)
+_NOTE_RE = re.compile(r"Board Customization Note:\s*(.+)", re.IGNORECASE)
+_ENGRAVING_LETTER_RE = re.compile(
+    r"Engraving Letter for Cheese Knife Handles:\s*(.+)", re.IGNORECASE
+)
+_GIFT_RE = re.compile(
+    r"Gift Note\s*&\s*Gift Bag:\s*(.*?)(?:Please CHECK for mistakes and spellings\.?:|$)",
+    re.IGNORECASE | re.DOTALL,
+)
+_GIFT_NO_RE = re.compile(r"\s*no\b", re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r"\s+")
+_SPELLING_RE = re.compile(
+    r"Please CHECK for mistakes and spellings\.?:\s*(.+)", re.IGNORECASE
 )
 
 
@@ -17,10 +53,10 @@ def _split_segments(full_text: str) -> List[str]:
     """
     Split the whole PDF text into segments per order using the 'Order ID' anchor.
     """
-    # Split but keep the 'Order ID:' marker at the beginning of each segment
-    parts = re.split(r"(?=Order ID:\s*\d{3}-\d{7}-\d{7})", full_text)
-    segments = [p for p in parts if "Order ID:" in p]
-    return segments
+    # Each segment runs from one 'Order ID:' marker to the next
+    starts = [m.start() for m in _SEGMENT_START_RE.finditer(full_text)]
+    ends = starts[1:] + [len(full_text)]
+    return [full_text[start:end] for start, end in zip(starts, ends)]
 
 
 def _extract_shipping_block(lines: List[str]):
@@ -47,28 +83,31 @@ def _extract_shipping_block(lines: List[str]):
         # City, ST ZIP
         # Country
         # -> We'll try to parse with some flexibility.
-        block = [l.strip() for l in lines[idx + 1: idx + 7] if l.strip()]
-
-        if block:
-            ship_to_name = block[0]
-        if len(block) >= 2:
-            address_line1 = block[1]
-
-        # find city/state/zip line (contains 5-digit zip)
+        # Single pass over the next lines: name, address, the first
+        # city/state/zip line (contains 5-digit zip) and the last line.
         csz_line = ""
-        for l in block[1:]:
-            if re.search(r"\b\d{5}(?:-\d{4})?\b", l):
-                csz_line = l
-                break
+        last_line = ""
+        n_found = 0
+        for raw in lines[idx + 1: idx + 7]:
+            l = raw.strip()
+            if not l:
+                continue
+            if n_found == 0:
+                ship_to_name = l
+            else:
+                if n_found == 1:
+                    address_line1 = l
+                if not csz_line and _ZIP_RE.search(l):
+                    csz_line = l
+            last_line = l
+            n_found += 1
 
         if csz_line:
             city, state, zipcode = extract_city_state_zip(csz_line)
 
         # Country is often last line
-        if block:
-            country_candidate = block[-1]
-            if re.search(r"united states|usa|canada|mexico", country_candidate.lower()):
-                country = country_candidate
+        if last_line and _COUNTRY_RE.search(last_line):
+            country = last_line
 
     return ship_to_name, address_line1, city, state, zipcode, country
 
@@ -80,35 +119,34 @@ def _extract_order_info(segment: str):
     sku = ""
     asin = ""
     quantity = 1
-    product_title = ""
 
     # Order ID
-    m = re.search(r"Order ID:\s*([\d-]+)", segment)
+    m = _ORDER_ID_RE.search(segment)
     if m:
         order_id = m.group(1).strip()
 
     # Order Item ID
-    m = re.search(r"Order Item ID:\s*([A-Z0-9]+)", segment)
+    m = _ORDER_ITEM_RE.search(segment)
     if m:
         order_item_id = m.group(1).strip()
 
     # Order Date
-    m = re.search(r"Order Date:\s*(.+)", segment)
+    m = _ORDER_DATE_RE.search(segment)
     if m:
         order_date_raw = m.group(1).strip()
 
     # SKU
-    m = re.search(r"SKU:\s*([A-Z0-9\-]+)", segment)
+    m = _SKU_RE.search(segment)
     if m:
         sku = m.group(1).strip()
 
     # ASIN
-    m = re.search(r"ASIN:\s*([A-Z0-9]+)", segment)
+    m = _ASIN_RE.search(segment)
     if m:
         asin = m.group(1).strip()
 
     # Quantity
-    m = re.search(r"(Qty|Quantity):\s*(\d+)", segment)
+    m = _QTY_RE.search(segment)
     if m:
         try:
             quantity = int(m.group(2))
@@ -146,34 +184,18 @@ def _extract_customization(segment: str):
     """
     # Limit to Customizations / Surface 1 block
     # We grab text from "Customizations:" until "Surface 2" or end
-    m = re.search(
-        r"Customizations:(.*?)(?:Surface 2:|$)",
-        segment,
-        flags=re.DOTALL | re.IGNORECASE,
-    )
+    m = _CUSTOMIZATIONS_RE.search(segment)
     block = m.group(1) if m else segment
 
     # Board type: Select Your Order
-    m = re.search(
-        r"Select Your Order:\s*(.+)",
-        block,
-        flags=re.IGNORECASE,
-    )
+    m = _ORDER_OPTION_RE.search(block)
     order_option_raw = m.group(1).strip() if m else ""
 
     # Design number
     design_number = None
-    m = re.search(
-        r"Choose Your Design\s*#?:\s*Design\s*(\d+)",
-        block,
-        flags=re.IGNORECASE,
-    )
+    m = _DESIGN_RE.search(block)
     if not m:
-        m = re.search(
-            r"Design\s*#?\s*[:\-]?\s*(\d+)",
-            block,
-            flags=re.IGNORECASE,
-        )
+        m = _DESIGN_FALLBACK_RE.search(block)
     if m:
         try:
             design_number = int(m.group(1))
@@ -181,19 +203,11 @@ def _extract_customization(segment: str):
             design_number = None
 
     # Board Customization Note
-    m = re.search(
-        r"Board Customization Note:\s*(.+)",
-        block,
-        flags=re.IGNORECASE,
-    )
+    m = _NOTE_RE.search(block)
     board_customization_note = m.group(1).strip() if m else ""
 
     # Engraving Letter
-    m = re.search(
-        r"Engraving Letter for Cheese Knife Handles:\s*(.+)",
-        block,
-        flags=re.IGNORECASE,
-    )
+    m = _ENGRAVING_LETTER_RE.search(block)
     engraving_letter = m.group(1).strip() if m else ""
     # DO NOT derive from customization note – if it's blank, keep blank
 
@@ -201,28 +215,20 @@ def _extract_customization(segment: str):
     gift_option = "NO"
     gift_message = ""
 
-    m = re.search(
-        r"Gift Note\s*&\s*Gift Bag:\s*(.*?)(?:Please CHECK for mistakes and spellings\.?:|$)",
-        block,
-        flags=re.IGNORECASE | re.DOTALL,
-    )
+    m = _GIFT_RE.search(block)
     if m:
         raw_gift_block = m.group(1).strip()
         # If contains 'no' as main answer -> NO
-        if re.match(r"\s*no\b", raw_gift_block, flags=re.IGNORECASE):
+        if _GIFT_NO_RE.match(raw_gift_block):
             gift_option = "NO"
             gift_message = ""
         else:
             gift_option = "YES"
-            gift_message = re.sub(r"\s+", " ", raw_gift_block).strip()
+            gift_message = _WHITESPACE_RE.sub(" ", raw_gift_block).strip()
 
     # Spelling confirmation
     spelling_confirmation = ""
-    m = re.search(
-        r"Please CHECK for mistakes and spellings\.?:\s*(.+)",
-        block,
-        flags=re.IGNORECASE,
-    )
+    m = _SPELLING_RE.search(block)
     if m:
         spelling_confirmation = m.group(1).strip()
 
@@ -237,24 +243,41 @@ def _extract_customization(segment: str):
     }
 
 
+def _extract_full_text(file_item) -> Optional[str]:
+    """
+    Worker: (file name, PDF bytes) -> text of all pages, or None on failure.
+    """
+    name, file_bytes = file_item
+    try:
+        with pymupdf.open(stream=file_bytes, filetype="pdf") as doc:
+            return "\n".join(
+                page.get_text("text", sort=True) for page in doc
+            )
+    except Exception as e:
+        # Fail-safe: skip this PDF
+        print(f"Error reading PDF {name}: {e}")
+        return None
+
+
 def parse_order_details_pdfs(uploaded_files) -> pd.DataFrame:
     """
     Main entrypoint: parse a list of uploaded Amazon 'Order Details' PDFs
     for charcuterie boards. Returns a DataFrame with one row per order
     (before quantity expansion).
     """
-    records = []
+    # Column-wise (one list per field) so the frame is built from arrays
+    cols = defaultdict(list)
+
+    file_items = [(uploaded.name, read_once(uploaded)) for uploaded in uploaded_files]
+    # Text extraction is the expensive part: run it across processes,
+    # but only when the upload is large enough to repay the pool start-up
+    total_bytes = sum(len(file_bytes) for _, file_bytes in file_items)
+    full_texts = process_map(
+        _extract_full_text, file_items, parallel=total_bytes >= PARALLEL_MIN_BYTES
+    )
 
-    for uploaded in uploaded_files:
-        try:
-            file_bytes = uploaded.read()
-            with pdfplumber.open(io.BytesIO(file_bytes)) as pdf:
-                full_text = "\n".join(
-                    page.extract_text() or "" for page in pdf.pages
-                )
-        except Exception as e:
-            # Fail-safe: skip this PDF
-            print(f"Error reading PDF {uploaded.name}: {e}")
+    for full_text in full_texts:
+        if full_text is None:
             continue
 
         segments = _split_segments(full_text)
@@ -280,40 +303,37 @@ def parse_order_details_pdfs(uploaded_files) -> pd.DataFrame:
             if ship_to_name:
                 buyer_short_name = ship_to_name.split()[0]
 
-            record = {
-                "buyer_name": buyer_short_name,
-                "ship_to_name": ship_to_name,
-                "address_line1": address_line1,
-                "city": city,
-                "state": state,
-                "zip": zipcode,
-                "country": country,
-                "order_id": info["order_id"],
-                "order_item_id": info["order_item_id"],
-                "order_date": parse_order_date(info["order_date_raw"]),
-                "product_title": info["product_title"],
-                "sku": info["sku"],
-                "asin": info["asin"],
-                "quantity": info["quantity"],
-                "order_option": normalize_board_type(
-                    cust["order_option_raw"]
-                ),
-                "design_number": cust["design_number"],
-                "board_customization_note": cust["board_customization_note"],
-                "engraving_letter": cust["engraving_letter"],
-                "gift_option": cust["gift_option"],
-                "gift_message": cust["gift_message"],
-                "spelling_confirmation": cust["spelling_confirmation"],
-            }
-
-            records.append(record)
-
-    if not records:
+            cols["buyer_name"].append(buyer_short_name)
+            cols["ship_to_name"].append(ship_to_name)
+            cols["address_line1"].append(address_line1)
+            cols["city"].append(city)
+            cols["state"].append(state)
+            cols["zip"].append(zipcode)
+            cols["country"].append(country)
+            cols["order_id"].append(info["order_id"])
+            cols["order_item_id"].append(info["order_item_id"])
+            cols["order_date"].append(info["order_date_raw"])
+            cols["product_title"].append(info["product_title"])
+            cols["sku"].append(info["sku"])
+            cols["asin"].append(info["asin"])
+            cols["quantity"].append(info["quantity"])
+            cols["order_option"].append(cust["order_option_raw"])
+            cols["design_number"].append(cust["design_number"])
+            cols["board_customization_note"].append(cust["board_customization_note"])
+            cols["engraving_letter"].append(cust["engraving_letter"])
+            cols["gift_option"].append(cust["gift_option"])
+            cols["gift_message"].append(cust["gift_message"])
+            cols["spelling_confirmation"].append(cust["spelling_confirmation"])
+
+    if not cols:
         return pd.DataFrame()
 
-    df = pd.DataFrame(records)
+    df = pd.DataFrame(cols)
 
     # Ensure types
+    df["order_date"] = parse_order_dates(df["order_date"])
+    df["order_option"] = normalize_board_types(df["order_option"])
+
     if "design_number" in df.columns:
         df["design_number"] = pd.to_numeric(
             df["design_number"], errors="coerce"
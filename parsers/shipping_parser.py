@@ -1,11 +1,13 @@
-import io
 import re
-from typing import List
+from typing import List, Optional
 
-import pdfplumber
+import pymupdf
 import pandas as pd
 
-from utils.helpers import safe_strip, extract_city_state_zip
+from utils.helpers import safe_strip, extract_city_state_zip, read_once
+from utils.parallel import PARALLEL_MIN_BYTES, process_map
+
+_ZIP_RE = re.compile(r"\b\d{5}(?:-\d{4})?\b")
 
 
 def _extract_label_from_page(text: str, page_index: int):
@@ -27,7 +29,7 @@ def _extract_label_from_page(text: str, page_index: int):
 
     csz_line = ""
     for l in non_empty[:10]:
-        if re.search(r"\b\d{5}(?:-\d{4})?\b", l):
+        if _ZIP_RE.search(l):
             csz_line = l
             break
 
@@ -45,6 +47,26 @@ def _extract_label_from_page(text: str, page_index: int):
     }
 
 
+def _extract_page_texts(file_item) -> Optional[List[Optional[str]]]:
+    """
+    Worker: (file name, PDF bytes) -> text per page (None for a page that
+    failed to extract), or None if the PDF could not be read.
+    """
+    name, file_bytes = file_item
+    try:
+        page_texts = []
+        with pymupdf.open(stream=file_bytes, filetype="pdf") as doc:
+            for page in doc:
+                try:
+                    page_texts.append(page.get_text("text", sort=True))
+                except Exception:
+                    page_texts.append(None)
+        return page_texts
+    except Exception as e:
+        print(f"Error reading shipping PDF {name}: {e}")
+        return None
+
+
 def parse_shipping_label_pdfs(uploaded_files) -> pd.DataFrame:
     """
     Parse shipping label PDFs into a DataFrame with one row per label.
@@ -58,27 +80,33 @@ def parse_shipping_label_pdfs(uploaded_files) -> pd.DataFrame:
     """
     labels = []
 
-    for file_idx, uploaded in enumerate(uploaded_files):
-        try:
-            # Reset file pointer in case it was read before
-            uploaded.seek(0)
-            file_bytes = uploaded.read()
-            with pdfplumber.open(io.BytesIO(file_bytes)) as pdf:
-                for page_idx, page in enumerate(pdf.pages):
-                    try:
-                        text = page.extract_text() or ""
-                        label_core = _extract_label_from_page(text, page_idx)
-                        if label_core:
-                            label_core["label_id"] = f"pdf{file_idx}_page_{page_idx}"
-                            label_core["source_file_index"] = file_idx
-                            label_core["source_file_name"] = uploaded.name
-                            label_core["page_index"] = page_idx
-                            labels.append(label_core)
-                    except Exception:
-                        continue
-        except Exception as e:
-            print(f"Error reading shipping PDF {uploaded.name}: {e}")
+    file_items = [(uploaded.name, read_once(uploaded)) for uploaded in uploaded_files]
+
+    # Text extraction is the expensive part: run it across processes,
+    # but only when the upload is large enough to repay the pool start-up
+    total_bytes = sum(len(file_bytes) for _, file_bytes in file_items)
+    page_texts_per_file = process_map(
+        _extract_page_texts, file_items, parallel=total_bytes >= PARALLEL_MIN_BYTES
+    )
+
+    for file_idx, (uploaded, page_texts) in enumerate(
+        zip(uploaded_files, page_texts_per_file)
+    ):
+        if page_texts is None:
             continue
+        for page_idx, text in enumerate(page_texts):
+            if text is None:
+                continue
+            try:
+                label_core = _extract_label_from_page(text, page_idx)
+                if label_core:
+                    label_core["label_id"] = f"pdf{file_idx}_page_{page_idx}"
+                    label_core["source_file_index"] = file_idx
+                    label_core["source_file_name"] = uploaded.name
+                    label_core["page_index"] = page_idx
+                    labels.append(label_core)
+            except Exception:
+                continue
 
     if not labels:
         return pd.DataFrame()
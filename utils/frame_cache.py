@@ -0,0 +1,85 @@
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional, Sequence
+
+import pandas as pd
+
+# On-disk cache of parsed DataFrames, keyed by uploaded PDF content
+CACHE_DIR = Path(".cache")
+MAX_CACHE_FILES = 20  # per prefix; least recently used files are evicted
+
+# Bump whenever parser output changes so frames from older code are not served
+CACHE_VERSION = 2
+
+
+def cache_key(file_bytes: Sequence[bytes], file_names: Sequence[str]) -> str:
+    """
+    Content hash of an upload set (names + bytes, length-prefixed),
+    salted with CACHE_VERSION.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"v{CACHE_VERSION}".encode("utf-8"))
+    for name, data in zip(file_names, file_bytes):
+        encoded_name = name.encode("utf-8")
+        h.update(len(encoded_name).to_bytes(8, "little"))
+        h.update(encoded_name)
+        h.update(len(data).to_bytes(8, "little"))
+        h.update(data)
+    return h.hexdigest()
+
+
+def _cache_path(prefix: str, key: str) -> Path:
+    return CACHE_DIR / f"{prefix}_{key}.parquet"
+
+
+def load_cached_frame(prefix: str, key: str) -> Optional[pd.DataFrame]:
+    """
+    Return the cached DataFrame for this key, or None on a miss.
+    """
+    path = _cache_path(prefix, key)
+    if not path.exists():
+        return None
+    try:
+        df = pd.read_parquet(path)
+        os.utime(path)  # mark as recently used
+        return df
+    except Exception as e:
+        print(f"Error reading cache file {path}: {e}")
+        return None
+
+
+def store_cached_frame(prefix: str, key: str, df: pd.DataFrame) -> None:
+    """
+    Write df to the cache (empty frames are not cached), then evict the
+    oldest files for this prefix beyond MAX_CACHE_FILES.
+    """
+    if df.empty:
+        return
+    path = _cache_path(prefix, key)
+    tmp_path = None
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        # Write to a temp file first so readers never see a partial file
+        fd, tmp_name = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+        os.close(fd)
+        tmp_path = Path(tmp_name)
+        df.to_parquet(tmp_path, compression="zstd")
+        os.replace(tmp_path, path)
+    except Exception as e:
+        print(f"Error writing cache file {path}: {e}")
+        if tmp_path is not None:
+            tmp_path.unlink(missing_ok=True)
+        return
+
+    cached = sorted(
+        CACHE_DIR.glob(f"{prefix}_*.parquet"),
+        key=lambda p: p.stat().st_mtime,
+        reverse=True,
+    )
+    for old in cached[MAX_CACHE_FILES:]:
+        try:
+            old.unlink()
+        except OSError:
+            continue
@@ -1,7 +1,10 @@
 import re
 from datetime import datetime
+from functools import lru_cache
 from dateutil import parser as date_parser
-from difflib import SequenceMatcher
+import numpy as np
+import pandas as pd
+from rapidfuzz import fuzz
 
 
 def safe_strip(text):
@@ -10,44 +13,54 @@ def safe_strip(text):
     return str(text).strip()
 
 
-def normalize_board_type(raw: str) -> str:
-    raw = safe_strip(raw)
-    lower = raw.lower()
-
-    if not raw:
-        return ""
-
-    if "no engraving" in lower:
-        return "No Engraving"
-
-    # Board only (no utensils)
-    if "board only" in lower and "utensil" not in lower:
-        return "Board Only"
-
-    # Board + utensil engraving variants
-    if any(k in lower for k in [
-        "board+utensils",
-        "board + utensils",
-        "board & utensils",
-        "board and utensils",
-        "board + cheese knife",
-        "board+cheese knife",
-        "board & knife",
-        "board and knife"
-    ]):
-        return "Board+Utensils Engraving"
-
-    # Fallback – return as-is if we can't map
-    return raw
+# Lowercase spellings of the "Board + Utensils" engraving option
+BOARD_UTENSIL_VARIANTS = [
+    "board+utensils",
+    "board + utensils",
+    "board & utensils",
+    "board and utensils",
+    "board + cheese knife",
+    "board+cheese knife",
+    "board & knife",
+    "board and knife"
+]
+_BOARD_UTENSIL_RE = "|".join(re.escape(k) for k in BOARD_UTENSIL_VARIANTS)
 
 
+def normalize_board_types(raw: pd.Series) -> pd.Series:
+    """
+    Map a column of raw order options to canonical board types:
+    "No Engraving", "Board Only" or "Board+Utensils Engraving".
+    Options that don't match are returned as-is (stripped).
+    """
+    raw = raw.fillna("").astype(str).str.strip()
+    lower = raw.str.lower()
+    conds = [
+        lower.str.contains("no engraving", regex=False),
+        lower.str.contains("board only", regex=False)
+        & ~lower.str.contains("utensil", regex=False),
+        lower.str.contains(_BOARD_UTENSIL_RE, regex=True),
+    ]
+    choices = ["No Engraving", "Board Only", "Board+Utensils Engraving"]
+    return pd.Series(
+        np.select(conds, choices, default=raw.to_numpy(dtype=object)),
+        index=raw.index,
+        dtype=object,
+    )
+
+
+# Known order date layouts, tried in order
+ORDER_DATE_FORMATS = ["%a, %b %d, %Y", "%b %d, %Y", "%Y-%m-%d"]
+
+
+@lru_cache(maxsize=4096)
 def parse_order_date(raw: str):
     raw = safe_strip(raw)
     if not raw:
         return ""
 
     # Typical Amazon: "Sat, Nov 15, 2025"
-    for fmt in ["%a, %b %d, %Y", "%b %d, %Y", "%Y-%m-%d"]:
+    for fmt in ORDER_DATE_FORMATS:
         try:
             dt = datetime.strptime(raw, fmt)
             return dt.date().isoformat()
@@ -62,6 +75,28 @@ def parse_order_date(raw: str):
         return raw  # keep original if parsing fails
 
 
+def parse_order_dates(raw: pd.Series) -> pd.Series:
+    """
+    Vectorized parse_order_date: each known format is tried column-wise;
+    only values none of them match fall back to parse_order_date.
+    """
+    raw = raw.fillna("").astype(str).str.strip()
+    non_empty = raw.ne("")
+    parsed = pd.Series(pd.NaT, index=raw.index, dtype="datetime64[ns]")
+
+    for fmt in ORDER_DATE_FORMATS:
+        todo = parsed.isna() & non_empty
+        if not todo.any():
+            break
+        parsed[todo] = pd.to_datetime(raw[todo], format=fmt, errors="coerce")
+
+    out = parsed.dt.strftime("%Y-%m-%d")
+    rest = out.isna() & non_empty
+    if rest.any():
+        out[rest] = raw[rest].map(parse_order_date)
+    return out.fillna("")
+
+
 def file_friendly_name(name: str) -> str:
     name = safe_strip(name)
     name = re.sub(r"\s+", "_", name)
@@ -69,6 +104,18 @@ def file_friendly_name(name: str) -> str:
     return name
 
 
+def read_once(uploaded) -> bytes:
+    """
+    Full contents of an uploaded file, read once and kept on the object.
+    Uses getvalue(), so the current file position does not matter.
+    """
+    data = getattr(uploaded, "_cached_bytes", None)
+    if data is None:
+        data = uploaded.getvalue()
+        uploaded._cached_bytes = data
+    return data
+
+
 def normalize_for_match(text: str) -> str:
     text = safe_strip(text).lower()
     text = re.sub(r"[^a-z0-9]", "", text)
@@ -80,10 +127,10 @@ def fuzzy_equal(a: str, b: str, threshold: float = 0.8) -> bool:
     b_norm = normalize_for_match(b)
     if not a_norm or not b_norm:
         return False
-    ratio = SequenceMatcher(None, a_norm, b_norm).ratio()
-    return ratio >= threshold
+    return fuzz.ratio(a_norm, b_norm) >= threshold * 100
 
 
+@lru_cache(maxsize=8192)
 def extract_city_state_zip(line: str):
     """
     Parse "City, ST 12345" or "City ST 12345-6789".
@@ -0,0 +1,25 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Sequence
+
+# Below this many bytes of PDF input, pool start-up costs more than it saves
+PARALLEL_MIN_BYTES = 8 * 1024 * 1024
+
+
+def process_map(fn: Callable, items: Sequence, parallel: bool = True) -> List:
+    """
+    map(fn, items) across worker processes, preserving order.
+    Runs in-process when `parallel` is False, for a single item,
+    or if the pool cannot be used.
+    `fn` must be a picklable module-level function.
+    """
+    if not parallel or len(items) <= 1:
+        return [fn(item) for item in items]
+    try:
+        workers = min(len(items), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            return list(ex.map(fn, items))
+    except Exception as e:
+        # Fail-safe: fall back to serial processing
+        print(f"Process pool unavailable, running serially: {e}")
+        return [fn(item) for item in items]